@@ -24,42 +24,60 @@ class OKXDEXConfig:
             "name": "Ethereum Mainnet",
             "nativeCurrency": "ETH",
             "rpcUrl": "https://eth-mainnet.g.alchemy.com/v2/",
-            "explorerUrl": "https://etherscan.io"
+            "explorerUrl": "https://etherscan.io",
+            "avgConfirmationTime": 15,  # seconds
+            "bridgeToken": "0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48",  # USDC
+            "bridgeTokenDecimals": 6
         },
         "polygon": {
             "chainId": "137",
             "name": "Polygon",
             "nativeCurrency": "MATIC",
             "rpcUrl": "https://polygon-rpc.com",
-            "explorerUrl": "https://polygonscan.com"
+            "explorerUrl": "https://polygonscan.com",
+            "avgConfirmationTime": 5,  # seconds
+            "bridgeToken": "0x3c499c542cEF5E3811e1192ce70d8cC03d5c3359",  # USDC
+            "bridgeTokenDecimals": 6
         },
         "arbitrum": {
             "chainId": "42161",
             "name": "Arbitrum One",
             "nativeCurrency": "ETH",
             "rpcUrl": "https://arb1.arbitrum.io/rpc",
-            "explorerUrl": "https://arbiscan.io"
+            "explorerUrl": "https://arbiscan.io",
+            "avgConfirmationTime": 2,  # seconds
+            "bridgeToken": "0xaf88d065e77c8cC2239327C5EDb3A432268e5831",  # USDC
+            "bridgeTokenDecimals": 6
         },
         "optimism": {
             "chainId": "10",
             "name": "Optimism",
             "nativeCurrency": "ETH",
             "rpcUrl": "https://mainnet.optimism.io",
-            "explorerUrl": "https://optimistic.etherscan.io"
+            "explorerUrl": "https://optimistic.etherscan.io",
+            "avgConfirmationTime": 2,  # seconds
+            "bridgeToken": "0x0b2C639c533813f4Aa9D7837Caf62653d097Ff85",  # USDC
+            "bridgeTokenDecimals": 6
         },
         "avalanche": {
             "chainId": "43114",
             "name": "Avalanche C-Chain",
             "nativeCurrency": "AVAX",
             "rpcUrl": "https://api.avax.network/ext/bc/C/rpc",
-            "explorerUrl": "https://snowtrace.io"
+            "explorerUrl": "https://snowtrace.io",
+            "avgConfirmationTime": 2,  # seconds
+            "bridgeToken": "0xB97EF9Ef8734C71904D8002F8b6Bc66Dd9c48a6E",  # USDC
+            "bridgeTokenDecimals": 6
         },
         "bsc": {
             "chainId": "56",
             "name": "BNB Smart Chain",
             "nativeCurrency": "BNB",
             "rpcUrl": "https://bsc-dataseed.binance.org",
-            "explorerUrl": "https://bscscan.com"
+            "explorerUrl": "https://bscscan.com",
+            "avgConfirmationTime": 3,  # seconds
+            "bridgeToken": "0x8AC76a51cc950d9822D68b83fE1Ad97B32Cd580d",  # USDC
+            "bridgeTokenDecimals": 18
         }
     }
     
@@ -77,6 +95,16 @@ class OKXDEXConfig:
         self.passphrase = os.environ.get('OKX_PASSPHRASE', '')
         self.project_id = os.environ.get('OKX_PROJECT_ID', 'agreex-contracts')
         self.simulate_mode = os.environ.get('OKX_SIMULATE_MODE', 'true').lower() == 'true'
+        self.request_timeout = float(os.environ.get('OKX_REQUEST_TIMEOUT', '10'))  # seconds
+        
+        # Payment routing ("cheapest" or "fastest")
+        self.route_policy = os.environ.get('OKX_ROUTE_POLICY', 'cheapest').lower()
+        self.route_cache_ttl = int(os.environ.get('OKX_ROUTE_CACHE_TTL', '30'))  # seconds
+        self.route_max_workers = int(os.environ.get('OKX_ROUTE_MAX_WORKERS', '6'))
+        self.route_wait_timeout = float(os.environ.get('OKX_ROUTE_WAIT_TIMEOUT', '30'))  # seconds
+        
+        # Bulk escrow creation
+        self.deploy_max_workers = int(os.environ.get('OKX_DEPLOY_MAX_WORKERS', '8'))
     
     def generate_signature(self, timestamp: str, method: str, request_path: str, body: str = '') -> str:
         """
@@ -137,6 +165,13 @@ class OKXDEXConfig:
     def get_chain_config(self, chain_name: str) -> Optional[Dict[str, str]]:
         """Get configuration for a specific chain"""
         return self.SUPPORTED_CHAINS.get(chain_name.lower())
+    
+    def get_chain_name(self, chain_id: str) -> Optional[str]:
+        """Get the chain name for a chain ID"""
+        for name, chain in self.SUPPORTED_CHAINS.items():
+            if chain["chainId"] == str(chain_id):
+                return name
+        return None
 
 # Singleton instance
 okx_config = OKXDEXConfig() 
\ No newline at end of file
@@ -5,20 +5,38 @@ Handles DEX operations, cross-chain verification, and payment automation
 
 import json
 import time
-from typing import Dict, List, Optional, Tuple
+import hashlib
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple, Union
 from decimal import Decimal
 import requests
 from okx_dex_config import okx_config
 
+NATIVE_TOKEN = "0x0000000000000000000000000000000000000000"
+
+# Payout token address, or a {chain: address} mapping for per-chain tokens
+PayoutToken = Union[str, Dict[str, str]]
+
 class OKXDEXClient:
     """Client for interacting with OKX DEX API"""
     
     def __init__(self):
         self.config = okx_config
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'AgreeX/1.0 OKX-DEX-Integration'
-        })
+        self._local = threading.local()
+    
+    @property
+    def session(self) -> requests.Session:
+        """HTTP session for the calling thread (Session is not thread-safe)"""
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update({
+                'User-Agent': 'AgreeX/1.0 OKX-DEX-Integration'
+            })
+            self._local.session = session
+        return session
     
     def get_quote(self, chain_id: str, from_token: str, to_token: str, amount: str) -> Dict:
         """
@@ -45,6 +63,8 @@ class OKXDEXClient:
                     "routerResult": {
                         "fromTokenAmount": amount,
                         "toTokenAmount": str(int(float(amount) * 0.95)),  # Simulate 5% price impact
+                        "fromToken": {"tokenUnitPrice": "1", "decimal": "18"},  # USD price
+                        "toToken": {"tokenUnitPrice": "1", "decimal": "18"},
                         "routes": [
                             {
                                 "percentage": 70,
@@ -66,12 +86,14 @@ class OKXDEXClient:
                         "data": "0x...",  # Simulated transaction data
                         "to": "0x1111111254fb6c44bac0bed2854e76f90643097d",  # OKX Aggregator contract
                         "value": "0",
-                        "gas": "250000"
+                        "gas": "250000",
+                        "gasPrice": "30000000000"  # wei
                     }
                 }]
             }
         
-        response = self.session.get(endpoint, params=params, headers=headers)
+        response = self.session.get(endpoint, params=params, headers=headers,
+                                    timeout=self.config.request_timeout)
         return response.json()
     
     def verify_contract_deployment(self, chain_id: str, contract_address: str) -> Dict:
@@ -100,7 +122,8 @@ class OKXDEXClient:
                 }
             }
         
-        response = self.session.post(endpoint, json=payload, headers=headers)
+        response = self.session.post(endpoint, json=payload, headers=headers,
+                                     timeout=self.config.request_timeout)
         return response.json()
     
     def check_milestone_completion(self, contract_address: str, milestone_id: int, chain_id: str) -> Dict:
@@ -129,13 +152,17 @@ class OKXDEXClient:
                 }
             }
         
-        response = self.session.get(endpoint, params=params, headers=headers)
+        response = self.session.get(endpoint, params=params, headers=headers,
+                                    timeout=self.config.request_timeout)
         return response.json()
     
     def initiate_payment_release(self, contract_address: str, milestone_id: int, 
-                                chain_id: str, recipient: str, amount: str) -> Dict:
+                                chain_id: str, recipient: str, amount: str,
+                                token_address: str = NATIVE_TOKEN,
+                                target_chain_id: Optional[str] = None) -> Dict:
         """
         Initiate payment release for completed milestone
+        Pays out on target_chain_id when the recipient is paid cross-chain
         """
         endpoint = f"{self.config.BASE_URL}{self.config.AGREEX_ENDPOINTS['payment_release']}"
         
@@ -145,10 +172,13 @@ class OKXDEXClient:
             "chainId": chain_id,
             "recipient": recipient,
             "amount": amount,
-            "tokenAddress": "0x0000000000000000000000000000000000000000",  # Native token
+            "tokenAddress": token_address,
             "releaseType": "milestone-completion"
         }
         
+        if target_chain_id and target_chain_id != chain_id:
+            payload["targetChainId"] = target_chain_id
+        
         headers = self.config.get_headers("POST", endpoint, json.dumps(payload))
         
         if self.config.simulate_mode:
@@ -166,7 +196,8 @@ class OKXDEXClient:
                 }
             }
         
-        response = self.session.post(endpoint, json=payload, headers=headers)
+        response = self.session.post(endpoint, json=payload, headers=headers,
+                                     timeout=self.config.request_timeout)
         return response.json()
     
     def verify_cross_chain_condition(self, source_chain: str, target_chain: str, 
@@ -194,43 +225,486 @@ class OKXDEXClient:
                     "targetBlockNumber": 52000000,
                     "bridgeProtocol": "OKX-Bridge",
                     "verificationTime": 45,  # seconds
+                    "bridgeFee": "0.5",  # USD
                     "proof": f"0x{'d' * 128}"
                 }
             }
         
-        response = self.session.post(endpoint, json=payload, headers=headers)
+        response = self.session.post(endpoint, json=payload, headers=headers,
+                                     timeout=self.config.request_timeout)
         return response.json()
 
+class PaymentRouter:
+    """
+    Selects the payout route for milestone releases across OKX DEX chains
+    Quotes every chain the freelancer can receive on and picks the cheapest
+    or fastest one according to the configured policy.
+    
+    Cross-chain routes swap the escrow token into the bridge asset (USDC) on
+    the source chain, bridge it, then swap into the payout token on the target
+    chain. Price impact, gas and bridge fees of every leg are valued in USD
+    with the aggregator's token prices and reported in escrow token units.
+    """
+    
+    POLICIES = ("cheapest", "fastest")
+    NATIVE_DECIMALS = 18
+    BRIDGE_ASSET_PRICE = Decimal(1)  # USDC, in USD
+    
+    def __init__(self, dex_client: OKXDEXClient, policy: Optional[str] = None,
+                 cache_ttl: Optional[int] = None, max_workers: Optional[int] = None):
+        self.dex_client = dex_client
+        self.policy = (policy or okx_config.route_policy).lower()
+        if self.policy not in self.POLICIES:
+            raise ValueError(f"Unsupported routing policy: {self.policy}")
+        
+        self.cache_ttl = okx_config.route_cache_ttl if cache_ttl is None else cache_ttl
+        self.max_workers = max_workers or okx_config.route_max_workers
+        self.wait_timeout = okx_config.route_wait_timeout
+        self.route_cache = {}
+        self._native_prices = {}
+        self._inflight = {}
+        self._cache_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                            thread_name_prefix="agreex-router")
+    
+    def select_route(self, source_chain: str, from_token: str, to_token: PayoutToken,
+                     amount: str, recipient_chains: Optional[List[str]] = None,
+                     condition_hash: str = "", policy: Optional[str] = None) -> Dict:
+        """
+        Select the payout route for a release
+        Only recipient_chains (default: every supported chain) are considered;
+        if none of them can be quoted the result has success False.
+        to_token is either an address valid on every chain (NATIVE_TOKEN) or a
+        {chain: address} mapping; any other address is only used on the
+        source chain. The chosen chain is cached per token pair for cache_ttl
+        seconds and re-quoted on hits, so estimates always match amount.
+        """
+        if not isinstance(source_chain, str) or not okx_config.validate_chain(source_chain):
+            raise ValueError(f"Unsupported chain: {source_chain}")
+        
+        policy = (policy or self.policy).lower()
+        if policy not in self.POLICIES:
+            raise ValueError(f"Unsupported routing policy: {policy}")
+        
+        source_chain = source_chain.lower()
+        chains = [c.lower() for c in (recipient_chains or okx_config.SUPPORTED_CHAINS.keys())
+                  if okx_config.validate_chain(c)]
+        
+        token_key = tuple(sorted(to_token.items())) if isinstance(to_token, dict) else to_token
+        cache_key = (source_chain, from_token, token_key, policy, tuple(sorted(chains)))
+        
+        while True:
+            leader = False
+            with self._cache_lock:
+                cached = self.route_cache.get(cache_key)
+                if not (cached and time.time() - cached["cachedAt"] < self.cache_ttl):
+                    cached = None
+                    # Only one caller quotes all chains for a key at a time
+                    event = self._inflight.get(cache_key)
+                    if event is None:
+                        event = self._inflight[cache_key] = threading.Event()
+                        leader = True
+            
+            if cached:
+                route = self._evaluate_route(source_chain, cached["chain"], from_token,
+                                             to_token, amount, condition_hash)
+                if route is not None:
+                    return {**route, "policy": policy, "cached": True}
+                # Cached chain can no longer be quoted; choose again
+                with self._cache_lock:
+                    if self.route_cache.get(cache_key) is cached:
+                        del self.route_cache[cache_key]
+                continue
+            
+            if not leader:
+                if not event.wait(self.wait_timeout):
+                    # Leader is stuck; quote on our own instead of queueing behind it
+                    return self._choose_route(cache_key, source_chain, chains, from_token,
+                                              to_token, amount, condition_hash, policy)
+                continue
+            
+            try:
+                return self._choose_route(cache_key, source_chain, chains, from_token,
+                                          to_token, amount, condition_hash, policy)
+            finally:
+                with self._cache_lock:
+                    del self._inflight[cache_key]
+                event.set()
+    
+    def clear_cache(self):
+        """Drop all cached route decisions and prices"""
+        with self._cache_lock:
+            self.route_cache.clear()
+            self._native_prices.clear()
+    
+    def close(self):
+        """Shut down the quoting thread pool"""
+        self._executor.shutdown(wait=True)
+    
+    def _choose_route(self, cache_key: Tuple, source_chain: str, chains: List[str],
+                      from_token: str, to_token: PayoutToken, amount: str,
+                      condition_hash: str, policy: str) -> Dict:
+        """Quote every candidate chain concurrently and cache the best one"""
+        futures = [
+            self._executor.submit(self._evaluate_route, source_chain, chain,
+                                  from_token, to_token, amount, condition_hash)
+            for chain in chains
+        ]
+        candidates = [f.result() for f in futures]
+        candidates = [c for c in candidates if c is not None]
+        
+        if not candidates:
+            return {
+                "success": False,
+                "error": f"No payout route available on {', '.join(chains) or 'any chain'}",
+                "policy": policy
+            }
+        
+        route = min(candidates, key=lambda c: self._route_rank(c, policy))
+        
+        with self._cache_lock:
+            self.route_cache[cache_key] = {"chain": route["chain"], "cachedAt": time.time()}
+        
+        return {**route, "policy": policy, "cached": False}
+    
+    def _evaluate_route(self, source_chain: str, target_chain: str, from_token: str,
+                        to_token: PayoutToken, amount: str,
+                        condition_hash: str) -> Optional[Dict]:
+        """Quote a single payout chain; returns None if the route is unusable"""
+        source_config = okx_config.get_chain_config(source_chain)
+        target_config = okx_config.get_chain_config(target_chain)
+        
+        payout_token = self._resolve_payout_token(to_token, source_chain, target_chain)
+        if payout_token is None:
+            return None
+        
+        cross_chain = target_chain != source_chain
+        latency = target_config["avgConfirmationTime"]
+        if cross_chain:
+            # The source leg has to confirm before bridging
+            latency += source_config["avgConfirmationTime"]
+        bridge_fee = Decimal(0)  # USD
+        
+        try:
+            amount_in = int(Decimal(amount))
+            
+            if cross_chain:
+                bridge = self.dex_client.verify_cross_chain_condition(
+                    source_chain, target_chain, condition_hash
+                )
+                bridge_data = bridge.get("data", {})
+                if bridge.get("code") != "0" or not bridge_data.get("verified"):
+                    return None
+                latency += bridge_data.get("verificationTime", 0)
+                bridge_fee = Decimal(str(bridge_data.get("bridgeFee", "0")))
+                
+                source_leg = self._quote_leg(source_chain, from_token,
+                                             source_config["bridgeToken"], amount_in)
+                # Same asset on both sides of the bridge, rescaled to target decimals
+                bridged = (source_leg["amountOut"] * 10 ** target_config["bridgeTokenDecimals"]
+                           // 10 ** source_config["bridgeTokenDecimals"])
+                target_leg = self._quote_leg(target_chain, target_config["bridgeToken"],
+                                             payout_token, bridged)
+                legs = [source_leg, target_leg]
+            else:
+                legs = [self._quote_leg(source_chain, from_token, payout_token, amount_in)]
+            
+            cost_usd = sum(leg["swapCost"] + leg["gasCost"] for leg in legs) + bridge_fee
+            price, scale = legs[0]["fromPrice"], legs[0]["fromScale"]
+            if price is None:
+                # Escrow token needed no swap; it is the bridge asset or the payout token
+                price = self.BRIDGE_ASSET_PRICE
+                scale = Decimal(10) ** source_config["bridgeTokenDecimals"]
+            
+            if not cost_usd:
+                cost = Decimal(0)
+            elif price <= 0:
+                return None
+            else:
+                cost = cost_usd / price * scale
+        except (requests.RequestException, KeyError, IndexError, TypeError,
+                ValueError, ArithmeticError):
+            return None
+        
+        return {
+            "success": True,
+            "chain": target_chain,
+            "chainId": target_config["chainId"],
+            "tokenAddress": payout_token,
+            "crossChain": cross_chain,
+            "quotedAmount": amount,
+            "expectedAmount": str(legs[-1]["amountOut"]),
+            "estimatedCost": str(int(cost)),  # escrow token units
+            "estimatedGas": str(sum(leg["gas"] for leg in legs)),
+            "estimatedLatency": latency  # seconds
+        }
+    
+    def _quote_leg(self, chain: str, from_token: str, to_token: str, amount: int) -> Dict:
+        """Quote one swap and value its price impact and gas in USD"""
+        if from_token.lower() == to_token.lower():
+            # Nothing to swap
+            return {
+                "amountOut": amount,
+                "gas": 0,
+                "fromPrice": None,
+                "fromScale": None,
+                "swapCost": Decimal(0),
+                "gasCost": Decimal(0)
+            }
+        
+        chain_config = okx_config.get_chain_config(chain)
+        quote = self.dex_client.get_quote(chain_config["chainId"], from_token, to_token, str(amount))
+        if quote.get("code") != "0" or not quote.get("data"):
+            raise ValueError(f"No quote on {chain}")
+        
+        quote_data = quote["data"][0]
+        result = quote_data["routerResult"]
+        from_price = Decimal(result["fromToken"]["tokenUnitPrice"])
+        from_scale = Decimal(10) ** int(result["fromToken"]["decimal"])
+        to_price = Decimal(result["toToken"]["tokenUnitPrice"])
+        to_scale = Decimal(10) ** int(result["toToken"]["decimal"])
+        received = int(Decimal(result["toTokenAmount"]))
+        
+        tx = quote_data.get("tx", {})
+        gas = int(tx.get("gas", 0))
+        gas_fee = gas * int(tx.get("gasPrice", 0))  # wei
+        gas_cost = Decimal(0)
+        if gas_fee:
+            native_price = from_price if from_token == NATIVE_TOKEN else self._native_price(chain)
+            gas_cost = Decimal(gas_fee) / Decimal(10) ** self.NATIVE_DECIMALS * native_price
+        
+        return {
+            "amountOut": received,
+            "gas": gas,
+            "fromPrice": from_price,
+            "fromScale": from_scale,
+            "swapCost": amount / from_scale * from_price - received / to_scale * to_price,
+            "gasCost": gas_cost
+        }
+    
+    def _native_price(self, chain: str) -> Decimal:
+        """USD price of a chain's native token, cached for cache_ttl seconds"""
+        with self._cache_lock:
+            cached = self._native_prices.get(chain)
+            if cached and time.time() - cached["cachedAt"] < self.cache_ttl:
+                return cached["price"]
+        
+        chain_config = okx_config.get_chain_config(chain)
+        quote = self.dex_client.get_quote(chain_config["chainId"], NATIVE_TOKEN,
+                                          chain_config["bridgeToken"],
+                                          str(10 ** self.NATIVE_DECIMALS))
+        price = Decimal(quote["data"][0]["routerResult"]["fromToken"]["tokenUnitPrice"])
+        
+        with self._cache_lock:
+            self._native_prices[chain] = {"price": price, "cachedAt": time.time()}
+        return price
+    
+    def _resolve_payout_token(self, to_token: PayoutToken, source_chain: str,
+                              target_chain: str) -> Optional[str]:
+        """Payout token address on target_chain, or None if it has none"""
+        if isinstance(to_token, dict):
+            return {c.lower(): a for c, a in to_token.items()}.get(target_chain) or None
+        # Token addresses differ per chain; only the native sentinel is shared
+        if to_token == NATIVE_TOKEN or target_chain == source_chain:
+            return to_token
+        return None
+    
+    def _route_rank(self, route: Dict, policy: str) -> Tuple:
+        """Sort key for a candidate route under the given policy"""
+        cost = int(route["estimatedCost"])
+        latency = route["estimatedLatency"]
+        # Prefer staying on the contract's chain when everything else is equal
+        cross_chain = route["crossChain"]
+        
+        if policy == "fastest":
+            return (latency, cost, cross_chain)
+        return (cost, latency, cross_chain)
+    
+
 class AgreeXContractManager:
     """Manages AgreeX contracts on OKX DEX ecosystem"""
     
+    ESCROW_FIELDS = ("employer", "freelancer", "amount", "token", "chain", "milestones")
+    
     def __init__(self):
         self.dex_client = OKXDEXClient()
+        self.payment_router = PaymentRouter(self.dex_client)
         self.contract_cache = {}
+        self._address_nonce = itertools.count()
     
     def create_escrow_contract(self, employer: str, freelancer: str, 
                              amount: str, token: str, chain: str, 
-                             milestones: List[Dict]) -> Dict:
+                             milestones: List[Dict],
+                             payout_chains: Optional[List[str]] = None,
+                             payout_token: PayoutToken = NATIVE_TOKEN) -> Dict:
         """
         Create a new escrow contract on OKX DEX
+        payout_chains lists the chains the freelancer can receive funds on;
+        payout_token may map each chain to its token address
+        """
+        self._validate_escrow_params(employer, freelancer, amount, token, chain,
+                                     milestones, payout_chains, payout_token)
+        
+        contract_data = self._build_contract_data(
+            employer, freelancer, amount, token, chain,
+            milestones, payout_chains, payout_token
+        )
+        
+        # Cache contract data
+        self.contract_cache[contract_data["address"]] = contract_data
+        
+        try:
+            return self._verify_deployment(contract_data)
+        except Exception:
+            # Deployment could not be confirmed; don't keep it around
+            self.contract_cache.pop(contract_data["address"], None)
+            raise
+    
+    def create_escrow_contracts(self, contracts: List[Dict],
+                              max_workers: Optional[int] = None) -> Dict:
+        """
+        Create escrow contracts in bulk
+        Every item is validated before anything is deployed; deployment
+        verifications then run concurrently, bounded by max_workers.
+        Items take the keyword arguments of create_escrow_contract.
         """
+        results = [None] * len(contracts)
+        pending = []
+        
+        # Validate all inputs up front
+        for index, params in enumerate(contracts):
+            if not isinstance(params, dict):
+                results[index] = {"index": index, "success": False,
+                                  "error": "Contract parameters must be a dict"}
+                continue
+            
+            missing = [f for f in self.ESCROW_FIELDS if f not in params]
+            if missing:
+                results[index] = {"index": index, "success": False,
+                                  "error": f"Missing fields: {', '.join(missing)}"}
+                continue
+            
+            args = [params[f] for f in self.ESCROW_FIELDS] + [
+                params.get("payout_chains"),
+                params.get("payout_token", NATIVE_TOKEN)
+            ]
+            
+            try:
+                self._validate_escrow_params(*args)
+                contract_data = self._build_contract_data(*args)
+            except ValueError as e:
+                results[index] = {"index": index, "success": False, "error": str(e)}
+                continue
+            
+            self.contract_cache[contract_data["address"]] = contract_data
+            pending.append((index, contract_data))
+        
+        def verify(item: Tuple[int, Dict]) -> Dict:
+            index, contract_data = item
+            try:
+                result = self._verify_deployment(contract_data)
+            except Exception as e:
+                # One failed item must not abort the rest of the batch
+                self.contract_cache.pop(contract_data["address"], None)
+                return {"index": index, "success": False,
+                        "address": contract_data["address"], "error": str(e)}
+            return {"index": index, **result}
+        
+        if pending:
+            workers = min(max_workers or okx_config.deploy_max_workers, len(pending))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                for result in executor.map(verify, pending):
+                    results[result["index"]] = result
+        
+        failed = sum(1 for r in results if not r["success"])
+        
+        return {
+            "success": failed == 0,
+            "total": len(contracts),
+            "created": len(contracts) - failed,
+            "failed": failed,
+            "results": results
+        }
+    
+    def _validate_escrow_params(self, employer: str, freelancer: str, amount: str,
+                                token: str, chain: str, milestones: List[Dict],
+                                payout_chains: Optional[List[str]] = None,
+                                payout_token: PayoutToken = NATIVE_TOKEN):
+        """Validate escrow parameters, raising ValueError on bad input"""
+        for name, value in (("employer", employer), ("freelancer", freelancer), ("token", token)):
+            if not isinstance(value, str) or not value:
+                raise ValueError(f"Invalid {name}: {value!r}")
+        
         # Validate chain
-        if not okx_config.validate_chain(chain):
+        if not isinstance(chain, str) or not okx_config.validate_chain(chain):
             raise ValueError(f"Unsupported chain: {chain}")
         
+        if payout_chains is not None and not isinstance(payout_chains, list):
+            raise ValueError("Payout chains must be a list")
+        for payout_chain in payout_chains or []:
+            if not isinstance(payout_chain, str) or not okx_config.validate_chain(payout_chain):
+                raise ValueError(f"Unsupported payout chain: {payout_chain}")
+        
+        if isinstance(payout_token, dict):
+            for payout_chain, address in payout_token.items():
+                if (not okx_config.validate_chain(str(payout_chain))
+                        or not isinstance(address, str) or not address):
+                    raise ValueError(f"Invalid payout token for {payout_chain}: {address!r}")
+        elif not isinstance(payout_token, str) or not payout_token:
+            raise ValueError(f"Invalid payout token: {payout_token!r}")
+        
+        total = self._parse_amount(amount, "amount")
+        
+        if not isinstance(milestones, list) or not milestones:
+            raise ValueError("Milestones must be a non-empty list")
+        
+        milestone_total = 0
+        for index, milestone in enumerate(milestones):
+            if not isinstance(milestone, dict) or "amount" not in milestone:
+                raise ValueError(f"Milestone {index} must be a dict with an amount")
+            milestone_total += self._parse_amount(milestone["amount"], f"milestone {index} amount")
+        
+        if milestone_total != total:
+            raise ValueError(f"Milestone amounts add up to {milestone_total}, expected {total}")
+    
+    def _parse_amount(self, amount: str, name: str) -> int:
+        """Parse a positive integer amount in the token's smallest unit"""
+        digits = str(amount) if isinstance(amount, (str, int)) and not isinstance(amount, bool) else ""
+        if not (digits.isascii() and digits.isdigit()) or int(digits) <= 0:
+            raise ValueError(f"Invalid {name}: {amount!r}")
+        return int(digits)
+    
+    def _generate_contract_address(self, employer: str, freelancer: str, chain_id: str) -> str:
+        """Simulate a unique contract address for a new deployment"""
+        seed = f"{employer}:{freelancer}:{chain_id}:{next(self._address_nonce)}:{time.time_ns()}"
+        return "0x" + hashlib.sha256(seed.encode()).hexdigest()[-40:]
+    
+    def _build_contract_data(self, employer: str, freelancer: str, amount: str,
+                             token: str, chain: str, milestones: List[Dict],
+                             payout_chains: Optional[List[str]],
+                             payout_token: PayoutToken) -> Dict:
+        """Build the cached record for a new escrow contract"""
         chain_config = okx_config.get_chain_config(chain)
         
+        if isinstance(payout_token, dict):
+            payout_token = {c.lower(): a for c, a in payout_token.items()}
+        
         # Simulate contract creation
-        contract_address = f"0x{'e' * 40}"
+        contract_address = self._generate_contract_address(
+            employer, freelancer, chain_config["chainId"]
+        )
         
-        contract_data = {
+        return {
             "address": contract_address,
             "chainId": chain_config["chainId"],
+            "chain": chain.lower(),
             "employer": employer,
             "freelancer": freelancer,
             "totalAmount": amount,
             "token": token,
             "milestones": milestones,
+            "payoutChains": [c.lower() for c in payout_chains or [chain]],
+            "payoutToken": payout_token,
             "createdAt": int(time.time()),
             "status": "active",
             "okxDexIntegration": {
@@ -239,9 +713,14 @@ class AgreeXContractManager:
                 "crossChainEnabled": True
             }
         }
-        
-        # Cache contract data
-        self.contract_cache[contract_address] = contract_data
+    
+    def _verify_deployment(self, contract_data: Dict) -> Dict:
+        """
+        Verify a contract deployment and attach the result
+        Contracts that fail verification are dropped from the cache
+        """
+        chain_config = okx_config.get_chain_config(contract_data["chain"])
+        contract_address = contract_data["address"]
         
         # Verify deployment
         verification = self.dex_client.verify_contract_deployment(
@@ -251,6 +730,16 @@ class AgreeXContractManager:
         
         contract_data["verification"] = verification.get("data", {})
         
+        if verification.get("code") != "0" or not contract_data["verification"].get("verified"):
+            # Deployment could not be confirmed; don't keep it around
+            self.contract_cache.pop(contract_address, None)
+            return {
+                "success": False,
+                "address": contract_address,
+                "error": f"Deployment verification failed (code {verification.get('code')})",
+                "verification": contract_data["verification"]
+            }
+        
         return {
             "success": True,
             "contract": contract_data,
@@ -276,20 +765,44 @@ class AgreeXContractManager:
         )
         
         if status.get("data", {}).get("status") == "completed":
+            # Pick the payout route across the freelancer's chains
+            condition_hash = "0x" + hashlib.sha256(
+                f"{contract_address}:{milestone_index}".encode()
+            ).hexdigest()
+            route = self.payment_router.select_route(
+                contract["chain"],
+                contract["token"],
+                contract["payoutToken"],
+                milestone["amount"],
+                contract["payoutChains"],
+                condition_hash
+            )
+            
+            if not route["success"]:
+                return {
+                    "success": False,
+                    "milestone": milestone_index,
+                    "error": route["error"],
+                    "message": "No payout route to the freelancer's chains"
+                }
+            
             # Initiate payment release
             payment_result = self.dex_client.initiate_payment_release(
                 contract_address,
                 milestone_index,
                 contract["chainId"],
                 contract["freelancer"],
-                milestone["amount"]
+                milestone["amount"],
+                token_address=route["tokenAddress"],
+                target_chain_id=route["chainId"]
             )
             
             return {
                 "success": True,
                 "milestone": milestone_index,
                 "paymentStatus": payment_result.get("data", {}),
-                "message": f"Payment of {milestone['amount']} initiated via OKX DEX"
+                "route": route,
+                "message": f"Payment of {milestone['amount']} initiated via OKX DEX on {route['chain']}"
             }
         
         return {
@@ -300,4 +813,4 @@ class AgreeXContractManager:
         }
 
 # Export main components
-__all__ = ['OKXDEXClient', 'AgreeXContractManager'] 
\ No newline at end of file
+__all__ = ['NATIVE_TOKEN', 'OKXDEXClient', 'PaymentRouter', 'AgreeXContractManager'] 
\ No newline at end of file
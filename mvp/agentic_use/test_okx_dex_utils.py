@@ -0,0 +1,435 @@
+"""
+Tests for AgreeX OKX DEX utilities
+Run with: pytest test_okx_dex_utils.py
+"""
+
+import threading
+import time
+
+import pytest
+import requests
+
+from okx_dex_config import okx_config
+from okx_dex_utils import NATIVE_TOKEN, OKXDEXClient, PaymentRouter, AgreeXContractManager
+
+ONE_TOKEN = 10 ** 18
+DAI = "0x6B175474E89094C44Da98b954EedeAC495271d0F"  # Escrow token on ethereum
+USDC = {name: c["bridgeToken"] for name, c in okx_config.SUPPORTED_CHAINS.items()}
+CHAIN_NAMES = {c["chainId"]: name for name, c in okx_config.SUPPORTED_CHAINS.items()}
+
+
+class FakeDEX:
+    """Scripted OKX DEX responses keyed by chain name"""
+
+    def __init__(self, rates=None, gas_prices=None, bridges=None, delay=0):
+        self.rates = rates or {}            # (chain, to_token) -> received / sent
+        self.gas_prices = gas_prices or {}  # chain -> wei
+        self.bridges = bridges or {}        # target chain -> bridge data overrides
+        self.delay = delay
+
+    def get_quote(self, chain_id, from_token, to_token, amount):
+        time.sleep(self.delay)
+        chain = CHAIN_NAMES[chain_id]
+        rate = self.rates.get((chain, to_token), self.rates.get(chain, 0.95))
+        if rate is None:
+            return {"code": "82000", "data": []}
+        return {
+            "code": "0",
+            "data": [{
+                "routerResult": {
+                    "fromTokenAmount": amount,
+                    "toTokenAmount": str(int(int(amount) * rate)),
+                    "fromToken": {"tokenUnitPrice": "1", "decimal": "18"},
+                    "toToken": {"tokenUnitPrice": "1", "decimal": "18"}
+                },
+                "tx": {"gas": "250000", "gasPrice": str(self.gas_prices.get(chain, 10 ** 10))}
+            }]
+        }
+
+    def verify_cross_chain_condition(self, source_chain, target_chain, condition_hash):
+        data = {"verified": True, "verificationTime": 45, "bridgeFee": "0"}
+        data.update(self.bridges.get(target_chain, {}))
+        return {"code": "0", "data": data}
+
+
+@pytest.fixture
+def make_router(mocker):
+    routers = []
+
+    def factory(fake=None, **kwargs):
+        fake = fake or FakeDEX()
+        client = mocker.Mock(spec=OKXDEXClient)
+        client.get_quote.side_effect = fake.get_quote
+        client.verify_cross_chain_condition.side_effect = fake.verify_cross_chain_condition
+        router = PaymentRouter(client, **kwargs)
+        routers.append(router)
+        return router
+
+    yield factory
+    for router in routers:
+        router.close()
+
+
+def test_cheapest_counts_swap_and_gas_in_escrow_units(make_router):
+    router = make_router(policy="cheapest")
+
+    route = router.select_route("ethereum", DAI, NATIVE_TOKEN,
+                                str(ONE_TOKEN), ["ethereum"])
+
+    # 5% price impact plus 250000 gas at 10 gwei, priced at 1 USD per token
+    assert route["chain"] == "ethereum"
+    assert route["estimatedCost"] == str(ONE_TOKEN * 5 // 100 + 250000 * 10 ** 10)
+    assert route["expectedAmount"] == str(ONE_TOKEN * 95 // 100)
+
+
+def test_cheapest_picks_lowest_total_cost(make_router):
+    fake = FakeDEX(rates={("ethereum", NATIVE_TOKEN): 0.5, "arbitrum": 0.99, "polygon": 0.99},
+                   gas_prices={"polygon": 10 ** 13})
+    router = make_router(fake, policy="cheapest")
+
+    route = router.select_route("ethereum", DAI, NATIVE_TOKEN,
+                                str(ONE_TOKEN), ["ethereum", "arbitrum", "polygon"])
+
+    # Polygon matches arbitrum on price impact but its gas is far more expensive
+    assert route["chain"] == "arbitrum"
+    assert route["crossChain"] is True
+    assert route["policy"] == "cheapest"
+
+
+def test_bridge_fee_counts_toward_cost(make_router):
+    fake = FakeDEX(rates={("ethereum", NATIVE_TOKEN): 0.9, "arbitrum": 0.99},
+                   bridges={"arbitrum": {"bridgeFee": "0.5"}})
+    router = make_router(fake, policy="cheapest")
+
+    route = router.select_route("ethereum", DAI, NATIVE_TOKEN,
+                                str(ONE_TOKEN), ["ethereum", "arbitrum"])
+
+    assert route["chain"] == "ethereum"
+
+
+def test_fastest_picks_lowest_latency(make_router):
+    fake = FakeDEX(rates={"arbitrum": 0.5, "polygon": 0.99},
+                   bridges={"arbitrum": {"verificationTime": 5}})
+    router = make_router(fake, policy="fastest")
+
+    route = router.select_route("ethereum", DAI, NATIVE_TOKEN,
+                                str(ONE_TOKEN), ["arbitrum", "polygon"])
+
+    # Arbitrum costs more but bridges faster
+    assert route["chain"] == "arbitrum"
+    # Source swap confirms on ethereum, then the bridge, then arbitrum
+    assert route["estimatedLatency"] == 15 + 5 + 2
+
+
+def test_unverified_bridge_is_skipped(make_router):
+    fake = FakeDEX(rates={("ethereum", NATIVE_TOKEN): 0.5, "arbitrum": 0.99},
+                   bridges={"arbitrum": {"verified": False}})
+    router = make_router(fake)
+
+    route = router.select_route("ethereum", DAI, NATIVE_TOKEN,
+                                str(ONE_TOKEN), ["ethereum", "arbitrum"])
+
+    assert route["chain"] == "ethereum"
+
+
+def test_fails_without_quotable_route(make_router):
+    router = make_router(FakeDEX(rates={"ethereum": None, "arbitrum": None}))
+
+    route = router.select_route("ethereum", DAI, NATIVE_TOKEN,
+                                str(ONE_TOKEN), ["ethereum", "arbitrum"])
+
+    assert route["success"] is False
+    assert "chain" not in route
+
+
+def test_only_routes_over_recipient_chains(make_router):
+    fake = FakeDEX(rates={"arbitrum": None, "polygon": None})
+    router = make_router(fake)
+
+    # Ethereum would quote fine but the freelancer can't receive there
+    route = router.select_route("ethereum", DAI, NATIVE_TOKEN,
+                                str(ONE_TOKEN), ["arbitrum", "polygon"])
+
+    assert route["success"] is False
+
+
+def test_mapping_without_quotable_chain_does_not_pay_native(make_router):
+    router = make_router(FakeDEX(rates={"arbitrum": None}))
+
+    route = router.select_route("ethereum", DAI, {"arbitrum": "0xabc"},
+                                str(ONE_TOKEN), ["ethereum", "arbitrum"])
+
+    assert route["success"] is False
+
+
+def test_mapping_keys_are_case_insensitive(make_router):
+    router = make_router()
+
+    route = router.select_route("ethereum", DAI, {"Arbitrum": "0xabc"},
+                                str(ONE_TOKEN), ["ethereum", "arbitrum"])
+
+    assert route["chain"] == "arbitrum"
+    assert route["tokenAddress"] == "0xabc"
+
+
+def test_bridge_asset_legs_are_not_swapped(make_router):
+    fake = FakeDEX(bridges={"arbitrum": {"bridgeFee": "0.5"}})
+    router = make_router(fake)
+    amount = 10 ** 6  # 1 USDC
+
+    route = router.select_route("ethereum", USDC["ethereum"], {"arbitrum": USDC["arbitrum"]},
+                                str(amount), ["arbitrum"])
+
+    # Only the bridge fee is paid, valued in escrow USDC units
+    router.dex_client.get_quote.assert_not_called()
+    assert route["expectedAmount"] == str(amount)
+    assert route["estimatedCost"] == str(amount // 2)
+    assert route["estimatedGas"] == "0"
+
+
+def test_unsupported_source_chain_is_rejected(make_router):
+    router = make_router()
+
+    with pytest.raises(ValueError, match="Unsupported chain"):
+        router.select_route("solana", DAI, NATIVE_TOKEN, str(ONE_TOKEN), ["ethereum"])
+
+
+def test_client_requests_use_timeout(mocker):
+    client = OKXDEXClient()
+    mocker.patch.object(client.config, "simulate_mode", False)
+    session = mocker.Mock()
+    client._local.session = session
+
+    client.get_quote("1", DAI, NATIVE_TOKEN, "100")
+    client.verify_cross_chain_condition("ethereum", "arbitrum", "0x0")
+
+    assert session.get.call_args.kwargs["timeout"] == client.config.request_timeout
+    assert session.post.call_args.kwargs["timeout"] == client.config.request_timeout
+
+
+def test_payout_token_address_is_per_chain(make_router):
+    usdt = "0xdAC17F958D2ee523a2206206994597C13D831ec7"
+    fake = FakeDEX(rates={("ethereum", usdt): 0.5, "arbitrum": 0.99})
+    router = make_router(fake)
+
+    # A bare address is only valid on the source chain
+    route = router.select_route("ethereum", DAI, usdt, str(ONE_TOKEN),
+                                ["ethereum", "arbitrum"])
+    assert route["chain"] == "ethereum"
+
+    arbitrum_usdt = "0xFd086bC7CD5C481DCC9C85ebE478A1C0b69FCbb9"
+    route = router.select_route("ethereum", DAI,
+                                {"ethereum": usdt, "arbitrum": arbitrum_usdt},
+                                str(ONE_TOKEN), ["ethereum", "arbitrum"])
+    assert route["chain"] == "arbitrum"
+    assert route["tokenAddress"] == arbitrum_usdt
+
+
+def test_cache_hit_requotes_only_chosen_chain(make_router):
+    router = make_router(cache_ttl=60)
+    client = router.dex_client
+    chains = ["ethereum", "arbitrum", "polygon"]
+
+    first = router.select_route("ethereum", DAI, NATIVE_TOKEN, "100000", chains)
+    client.verify_cross_chain_condition.reset_mock()
+    client.get_quote.reset_mock()
+    second = router.select_route("ethereum", DAI, NATIVE_TOKEN, "999999", chains)
+
+    assert first["cached"] is False
+    assert second["cached"] is True
+    assert second["chain"] == first["chain"]
+    assert second["quotedAmount"] == "999999"
+    assert second["expectedAmount"] == str(int(999999 * 0.95))
+    client.verify_cross_chain_condition.assert_not_called()
+    assert client.get_quote.call_count == 1
+
+
+def test_cache_expires_after_ttl(make_router):
+    router = make_router(cache_ttl=0)
+
+    router.select_route("ethereum", DAI, NATIVE_TOKEN, "100000", ["ethereum", "arbitrum"])
+    route = router.select_route("ethereum", DAI, NATIVE_TOKEN, "100000", ["ethereum", "arbitrum"])
+
+    assert route["cached"] is False
+
+
+def test_concurrent_misses_quote_once(make_router):
+    router = make_router(FakeDEX(delay=0.02), cache_ttl=60)
+    client = router.dex_client
+    chains = ["ethereum", "arbitrum", "polygon"]
+    routes = []
+
+    threads = [
+        threading.Thread(target=lambda: routes.append(
+            router.select_route("ethereum", DAI, NATIVE_TOKEN, "100000", chains)
+        ))
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Only the first caller checks the cross-chain candidates
+    assert client.verify_cross_chain_condition.call_count == 2
+    assert sorted(r["cached"] for r in routes) == [False, True, True, True]
+
+
+def test_followers_stop_waiting_for_stuck_leader(make_router):
+    router = make_router(FakeDEX(delay=0.1), cache_ttl=60)
+    router.wait_timeout = 0.01
+    routes = []
+
+    threads = [
+        threading.Thread(target=lambda: routes.append(
+            router.select_route("ethereum", DAI, NATIVE_TOKEN, "100000", ["ethereum"])
+        ))
+        for _ in range(2)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert [r["cached"] for r in routes] == [False, False]
+
+
+def test_release_fails_without_payout_route(mocker):
+    manager = AgreeXContractManager()
+    fake = FakeDEX(rates={"arbitrum": None})
+    manager.dex_client = mocker.Mock(spec=OKXDEXClient)
+    manager.dex_client.get_quote.side_effect = fake.get_quote
+    manager.dex_client.verify_cross_chain_condition.side_effect = fake.verify_cross_chain_condition
+    manager.dex_client.verify_contract_deployment.return_value = {"code": "0", "data": {"verified": True}}
+    manager.dex_client.check_milestone_completion.return_value = {"data": {"status": "completed"}}
+    manager.payment_router.dex_client = manager.dex_client
+
+    contract = manager.create_escrow_contract(
+        "0x1", "0x2", "100", DAI, "ethereum", [{"amount": "100"}],
+        payout_chains=["arbitrum"]
+    )
+    result = manager.process_milestone_completion(contract["contract"]["address"], 0)
+    manager.payment_router.close()
+
+    assert result["success"] is False
+    manager.dex_client.initiate_payment_release.assert_not_called()
+
+
+def test_unknown_policy_is_rejected(make_router):
+    with pytest.raises(ValueError):
+        make_router(policy="random")
+
+
+def escrow(**overrides):
+    params = {
+        "employer": "0x1111111111111111111111111111111111111111",
+        "freelancer": "0x2222222222222222222222222222222222222222",
+        "amount": "1000",
+        "token": NATIVE_TOKEN,
+        "chain": "ethereum",
+        "milestones": [{"description": "Design", "amount": "300"},
+                       {"description": "Delivery", "amount": "700"}]
+    }
+    params.update(overrides)
+    return params
+
+
+def verified(chain_id, contract_address):
+    return {"code": "0", "data": {"verified": True}}
+
+
+@pytest.fixture
+def manager(mocker):
+    manager = AgreeXContractManager()
+    manager.dex_client = mocker.Mock(spec=OKXDEXClient)
+    manager.dex_client.verify_contract_deployment.side_effect = verified
+    yield manager
+    manager.payment_router.close()
+
+
+def test_bulk_creates_contracts_with_unique_addresses(manager):
+    result = manager.create_escrow_contracts([escrow() for _ in range(50)], max_workers=4)
+
+    addresses = {r["contract"]["address"] for r in result["results"]}
+    assert result["success"] is True
+    assert result["created"] == 50
+    assert len(addresses) == 50
+    assert set(manager.contract_cache) == addresses
+
+
+@pytest.mark.parametrize("params, error", [
+    ("not-a-dict", "must be a dict"),
+    ({"employer": "0x1"}, "Missing fields"),
+    (escrow(chain=None), "Unsupported chain"),
+    (escrow(chain="solana"), "Unsupported chain"),
+    (escrow(payout_chains=["ethereum", "solana"]), "Unsupported payout chain"),
+    (escrow(amount="ten"), "Invalid amount"),
+    (escrow(amount="-5"), "Invalid amount"),
+    (escrow(freelancer=""), "Invalid freelancer"),
+    (escrow(milestones=[]), "non-empty list"),
+    (escrow(milestones=[{"description": "Design"}]), "with an amount"),
+    (escrow(milestones=[{"amount": "300"}]), "add up to 300"),
+])
+def test_bulk_reports_invalid_items_without_deploying(manager, params, error):
+    result = manager.create_escrow_contracts([escrow(), params])
+
+    assert result["success"] is False
+    assert result["created"] == 1
+    assert result["results"][0]["success"] is True
+    assert result["results"][1]["success"] is False
+    assert error in result["results"][1]["error"]
+    assert manager.dex_client.verify_contract_deployment.call_count == 1
+    assert len(manager.contract_cache) == 1
+
+
+def test_bulk_reports_unverified_deployments(manager):
+    responses = iter([
+        {"code": "0", "data": {"verified": True}},
+        {"code": "50001", "data": {"verified": False}},
+        {"code": "0", "data": {"verified": False}},
+    ])
+    manager.dex_client.verify_contract_deployment.side_effect = lambda *args: next(responses)
+
+    result = manager.create_escrow_contracts([escrow(), escrow(), escrow()], max_workers=1)
+
+    assert result["created"] == 1
+    assert result["failed"] == 2
+    assert [r["success"] for r in result["results"]] == [True, False, False]
+    assert list(manager.contract_cache) == [result["results"][0]["contract"]["address"]]
+
+
+def test_bulk_isolates_unexpected_errors(manager):
+    def flaky(chain_id, contract_address):
+        if chain_id == okx_config.SUPPORTED_CHAINS["polygon"]["chainId"]:
+            raise KeyError("data")
+        return verified(chain_id, contract_address)
+
+    manager.dex_client.verify_contract_deployment.side_effect = flaky
+
+    result = manager.create_escrow_contracts([escrow(), escrow(chain="polygon"), escrow()])
+
+    assert [r["success"] for r in result["results"]] == [True, False, True]
+    assert result["results"][1]["address"] not in manager.contract_cache
+    assert len(manager.contract_cache) == 2
+
+
+def test_single_create_validates_and_checks_verification(manager):
+    with pytest.raises(ValueError):
+        manager.create_escrow_contract(**escrow(chain=None))
+
+    manager.dex_client.verify_contract_deployment.side_effect = (
+        lambda *args: {"code": "50001", "data": {"verified": False}}
+    )
+    result = manager.create_escrow_contract(**escrow())
+
+    assert result["success"] is False
+    assert manager.contract_cache == {}
+
+
+def test_single_create_drops_contract_when_verification_raises(manager):
+    manager.dex_client.verify_contract_deployment.side_effect = requests.ConnectionError("down")
+
+    with pytest.raises(requests.ConnectionError):
+        manager.create_escrow_contract(**escrow())
+
+    assert manager.contract_cache == {}